@@ -1,13 +1,35 @@
+import os
 import re
+import json
+import numpy as np
 import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from datetime import datetime
+from functools import lru_cache
+from io import BytesIO
 from reportlab.lib.pagesizes import letter, A4
 from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_RIGHT, TA_LEFT
+from reportlab.lib.enums import TA_CENTER, TA_LEFT
+
+try:
+    import pyarrow  # noqa: F401  opcional: operações de texto vetorizadas em C++ (Arrow)
+    TITULO_DTYPE = 'string[pyarrow]'
+except ImportError:
+    TITULO_DTYPE = 'string'
+
+try:
+    import ahocorasick  # opcional: pip install pyahocorasick
+except ImportError:
+    ahocorasick = None
+
+try:
+    from pypdf import PdfWriter  # opcional: PDF gerado por partes (um mês por vez) e unido no final
+except ImportError:
+    PdfWriter = None
 
 CATEGORIAS_PALAVRAS_CHAVE = {
     'Supermercado': ['supermercado', 'mateus', 'mix', 'atacadao'],
@@ -19,31 +41,168 @@ CATEGORIAS_PALAVRAS_CHAVE = {
     'Casa': ['energia', 'agua', 'aluguel', 'internet']
 }
 
+FORMATO_DATA = '%Y-%m-%d'  # formato das datas nos CSVs exportados pelo Nubank
+
+TIPO_DTYPE = pd.CategoricalDtype(['Compra', 'Pagamento', 'IOF'])
+
+PADRAO_PARCELA = re.compile(r'parcela (\d+)/(\d+)', re.IGNORECASE)
+
+# Uma regex (alternação das palavras-chave) por categoria, na ordem de prioridade.
+# Mantidas como texto: o dtype string[pyarrow] não aceita padrões compilados em str.contains.
+PADROES_CATEGORIAS = {
+    categoria: '|'.join(re.escape(palavra) for palavra in palavras)
+    for categoria, palavras in CATEGORIAS_PALAVRAS_CHAVE.items()
+}
+
+def _montar_automato():
+    """Monta um autômato Aho-Corasick com todas as palavras-chave (palavra -> (prioridade, categoria))."""
+    automato = ahocorasick.Automaton()
+    for prioridade, (categoria, palavras) in enumerate(CATEGORIAS_PALAVRAS_CHAVE.items()):
+        for palavra in palavras:
+            # Palavras repetidas ('uber', '99') ficam com a categoria de maior prioridade.
+            if palavra not in automato:
+                automato.add_word(palavra, (prioridade, categoria))
+    automato.make_automaton()
+    return automato
+
+AUTOMATO_CATEGORIAS = _montar_automato() if ahocorasick else None
+
+def _categorizar_com_automato(titulo_lower):
+    """Varre o título uma única vez e retorna a categoria de maior prioridade encontrada."""
+    encontradas = [valor for _, valor in AUTOMATO_CATEGORIAS.iter(titulo_lower)]
+    return min(encontradas)[1] if encontradas else 'Outros'
+
 def categorizar_transacao(titulo):
     """Categoriza uma transação com base no seu título."""
     if pd.isna(titulo):
         return 'Outros'
     titulo_lower = str(titulo).lower()
     
+    if AUTOMATO_CATEGORIAS is not None:
+        return _categorizar_com_automato(titulo_lower)
+    
     for categoria, palavras in CATEGORIAS_PALAVRAS_CHAVE.items():
         if any(palavra in titulo_lower for palavra in palavras):
             return categoria
             
     return 'Outros' 
 
+def categorizar_titulos(titulos, minusculos=False):
+    """Versão vetorizada de categorizar_transacao para uma Series de títulos.
+
+    Use minusculos=True quando os títulos já estiverem em minúsculas e sem nulos.
+    """
+    # Com títulos em Arrow as regex rodam em C++ e superam o laço Python do autômato;
+    # com strings Python o autômato (uma passada por título) é o mais rápido.
+    titulos_arrow = isinstance(titulos.dtype, pd.StringDtype) and titulos.dtype.storage == 'pyarrow'
+    if AUTOMATO_CATEGORIAS is not None and not titulos_arrow:
+        # Uma única passada por título, em vez de uma regex por categoria.
+        titulos_lower = titulos if minusculos else titulos.fillna('').astype(str).str.lower()
+        return pd.Series([_categorizar_com_automato(t) for t in titulos_lower],
+                         index=titulos.index, dtype=object)
+    
+    categorias = pd.Series('Outros', index=titulos.index, dtype=object)
+    # Ordem reversa: categorias de maior prioridade sobrescrevem as demais.
+    for categoria, padrao in reversed(PADROES_CATEGORIAS.items()):
+        categorias[titulos.str.contains(padrao, case=minusculos, na=False)] = categoria
+    return categorias
+
+# Cache título -> categoria entre execuções (a maioria dos títulos se repete a cada nova fatura)
+CAMINHO_CACHE_CATEGORIAS = Path('.categorias_cache.json')
+
+def _carregar_cache_categorias():
+    """Lê o cache de categorias; descarta-o se as palavras-chave mudaram desde que foi salvo."""
+    try:
+        dados = json.loads(CAMINHO_CACHE_CATEGORIAS.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return {}
+    if not isinstance(dados, dict) or dados.get('palavras_chave') != CATEGORIAS_PALAVRAS_CHAVE:
+        return {}
+    categorias = dados.get('categorias')
+    return categorias if isinstance(categorias, dict) else {}
+
+def _salvar_cache_categorias(cache):
+    """Grava o cache de categorias; falhas de escrita apenas desativam o cache."""
+    dados = {'palavras_chave': CATEGORIAS_PALAVRAS_CHAVE, 'categorias': cache}
+    try:
+        CAMINHO_CACHE_CATEGORIAS.write_text(json.dumps(dados, ensure_ascii=False), encoding='utf-8')
+    except OSError:
+        pass
+
+def categorizar_titulos_com_cache(titulos_lower):
+    """Como categorizar_titulos (títulos já em minúsculas), classificando só os títulos nunca vistos."""
+    cache = _carregar_cache_categorias()
+    categorias = titulos_lower.map(cache).astype(object)
+    novos = categorias.isna()
+    if novos.any():
+        titulos_novos = titulos_lower[novos].drop_duplicates()
+        classificados = dict(zip(titulos_novos, categorizar_titulos(titulos_novos, minusculos=True)))
+        categorias[novos] = titulos_lower[novos].map(classificados).astype(object)
+        cache.update(classificados)
+        _salvar_cache_categorias(cache)
+    return categorias
+
+# Troca ',' <-> '.' numa única passada (1,234.56 -> 1.234,56)
+_TROCA_SEPARADORES = str.maketrans(',.', '.,')
+
+def _formatar_numero(valor):
+    """Número com separadores brasileiros e 2 casas decimais (sem sinal nem símbolo)."""
+    return f"{valor:,.2f}".translate(_TROCA_SEPARADORES)
+
 def formatar_valor(valor, com_sinal=False):
     """Formata valor para padrão brasileiro R$"""
     sinal = ''
     if com_sinal:
         sinal = '+' if valor >= 0 else '-'
     
-    valor_fmt = f"{abs(valor):,.2f}".replace(',', '_').replace('.', ',').replace('_', '.')
-    return f"{sinal} R$ {valor_fmt}"
+    return f"{sinal} R$ {_formatar_numero(abs(valor))}"
+
+def formatar_valores(valores, com_sinal=False):
+    """Versão vetorizada de formatar_valor: formata um array de valores de uma só vez."""
+    valores = np.asarray(valores, dtype=float)
+    if valores.size == 0:
+        return np.array([], dtype=object)
+    corpo = pd.Series(np.abs(valores)).map(_formatar_numero)
+    if com_sinal:
+        prefixo = pd.Series(np.where(valores >= 0, '+ R$ ', '- R$ '))
+    else:
+        prefixo = ' R$ '
+    return (prefixo + corpo).to_numpy(dtype=object)
+
+def _ler_arquivo_nubank(arquivo):
+    """Lê um único CSV do Nubank. Retorna (dataframe, erro); apenas um deles é preenchido."""
+    colunas_essenciais = ['date', 'title', 'amount']
+    try:
+        # Lê só o cabeçalho para validar as colunas antes da leitura completa
+        colunas = pd.read_csv(arquivo, nrows=0).columns
+        if not all(col in colunas for col in colunas_essenciais):
+            return None, f"  Erro: Arquivo {arquivo.name} não possui colunas esperadas ({', '.join(colunas_essenciais)})"
+        # Só as colunas usadas, com tipos explícitos (evita inferência de tipos)
+        df = pd.read_csv(arquivo, usecols=colunas_essenciais,
+                         dtype={'title': TITULO_DTYPE, 'amount': 'float64'},
+                         parse_dates=['date'], date_format=FORMATO_DATA)
+    except Exception as e:
+        return None, f"  ✗ Erro ao ler {arquivo.name}: {e}"
+    df['arquivo_origem'] = arquivo.name
+    return df, None
+
+def _listar_csvs_nubank(pasta):
+    """Lista os arquivos 'Nubank_*.csv' da pasta (filtro por nome, sem glob)."""
+    # normcase reproduz o glob: sensível a maiúsculas no Linux/macOS, insensível no Windows
+    prefixo, sufixo = os.path.normcase('Nubank_'), os.path.normcase('.csv')
+    try:
+        with os.scandir(pasta) as entradas:
+            return [Path(entrada.path) for entrada in entradas
+                    if os.path.normcase(entrada.name).startswith(prefixo)
+                    and os.path.normcase(entrada.name).endswith(sufixo)
+                    and entrada.is_file()]
+    except OSError:
+        return []
 
 def processar_arquivos_nubank(caminho_pasta):
     """Processa todos os arquivos CSV do Nubank em uma pasta."""
     pasta = Path(caminho_pasta)
-    arquivos_csv = list(pasta.glob("Nubank_*.csv"))
+    arquivos_csv = _listar_csvs_nubank(pasta)
     
     if not arquivos_csv:
         print(f"Nenhum arquivo CSV 'Nubank_*.csv' encontrado na pasta: {pasta.resolve()}")
@@ -52,18 +211,17 @@ def processar_arquivos_nubank(caminho_pasta):
     dfs = []
     print(f"Encontrados {len(arquivos_csv)} arquivos. Lendo...")
     
-    for arquivo in arquivos_csv:
-        try:
-            df = pd.read_csv(arquivo)
-            colunas_essenciais = ['date', 'title', 'amount']
-            if not all(col in df.columns for col in colunas_essenciais):
-                print(f"  Erro: Arquivo {arquivo.name} não possui colunas esperadas ({', '.join(colunas_essenciais)})")
-                continue
-            df['arquivo_origem'] = arquivo.name
-            dfs.append(df)
-            print(f"  ✓ Arquivo lido: {arquivo.name} ({len(df)} transações)")
-        except Exception as e:
-            print(f"  ✗ Erro ao ler {arquivo.name}: {e}")
+    # Leitura é I/O-bound e independente por arquivo: lê em paralelo e
+    # imprime o resultado na ordem original dos arquivos.
+    with ThreadPoolExecutor(max_workers=min(32, len(arquivos_csv))) as executor:
+        resultados = list(executor.map(_ler_arquivo_nubank, arquivos_csv))
+    
+    for arquivo, (df, erro) in zip(arquivos_csv, resultados):
+        if erro:
+            print(erro)
+            continue
+        dfs.append(df)
+        print(f"  ✓ Arquivo lido: {arquivo.name} ({len(df)} transações)")
     
     if not dfs:
         print("Nenhum arquivo pôde ser lido.")
@@ -74,43 +232,93 @@ def processar_arquivos_nubank(caminho_pasta):
 
 def limpar_e_processar_dados(df):
     """Limpa, processa e categoriza os dados do dataframe."""
-    df['date'] = pd.to_datetime(df['date'], errors='coerce')
+    df['date'] = pd.to_datetime(df['date'], format=FORMATO_DATA, errors='coerce', cache=True)
     df = df.dropna(subset=['date'])  # Remove linhas com data inválida
     df['mes_ano'] = df['date'].dt.to_period('M')
-    df['tipo'] = 'Compra'
-    df.loc[df['title'].str.contains('Pagamento recebido', case=False, na=False), 'tipo'] = 'Pagamento'
-    df.loc[df['title'].str.contains('IOF', case=False, na=False), 'tipo'] = 'IOF'
-    df['parcelado'] = df['title'].str.contains('Parcela', case=False, na=False)
-    padrao_parcela = r'Parcela (\d+)/(\d+)'
-    df[['num_parcela', 'total_parcelas']] = df['title'].str.extract(padrao_parcela, flags=re.IGNORECASE)
-    df['num_parcela'] = pd.to_numeric(df['num_parcela'], errors='coerce')
-    df['total_parcelas'] = pd.to_numeric(df['total_parcelas'], errors='coerce')
-    df['categoria'] = df['title'].apply(categorizar_transacao)
+    # Títulos em minúsculas calculados uma única vez e reutilizados por todas as buscas
+    titulos_lower = df['title'].fillna('').str.lower()
+    df['tipo'] = np.where(titulos_lower.str.contains('iof', regex=False), 'IOF',
+                          np.where(titulos_lower.str.contains('pagamento recebido', regex=False), 'Pagamento', 'Compra'))
+    df['parcelado'] = titulos_lower.str.contains('parcela', regex=False).astype(bool)
+    # Regex aplicada só às linhas que mencionam "parcela"
+    df['num_parcela'] = pd.Series(pd.NA, index=df.index, dtype='Int16')
+    df['total_parcelas'] = pd.Series(pd.NA, index=df.index, dtype='Int16')
+    parcelas = titulos_lower[df['parcelado']].str.extract(PADRAO_PARCELA)
+    df.loc[parcelas.index, 'num_parcela'] = pd.to_numeric(parcelas[0], errors='coerce').astype('Int16')
+    df.loc[parcelas.index, 'total_parcelas'] = pd.to_numeric(parcelas[1], errors='coerce').astype('Int16')
+    df['categoria'] = categorizar_titulos_com_cache(titulos_lower)
     df.loc[df['tipo'] != 'Compra', 'categoria'] = df['tipo']
+    # Colunas de baixa cardinalidade como Categorical: menos memória e groupby/filtros sobre códigos inteiros
+    df['tipo'] = df['tipo'].astype(TIPO_DTYPE)
+    df['categoria'] = df['categoria'].astype('category')
+    df['arquivo_origem'] = df['arquivo_origem'].astype('category')
     
     return df
 
-def imprimir_resumo_console(df):
+def _gastos_categoria_do_mes(gastos_categoria, mes):
+    """Gastos positivos por categoria de um mês, do maior para o menor."""
+    if mes not in gastos_categoria.index:
+        return pd.Series(dtype=float)
+    gastos_cat = gastos_categoria.loc[mes].sort_values(ascending=False)
+    return gastos_cat[gastos_cat > 0]
+
+def _top5_por_mes(compras):
+    """As 5 maiores compras de cada mês, da maior para a menor (em empates vence a primeira)."""
+    # nlargest por grupo seleciona o top-5 de cada mês sem ordenar todas as compras
+    maiores = compras.groupby('mes_ano', observed=True)['amount'].nlargest(5)
+    return compras.loc[maiores.index.get_level_values(-1).rename(None)]
+
+def montar_relatorio(df):
+    """Calcula uma única vez tudo o que o console e o PDF exibem.
+
+    Retorna um dict com os valores de cada mês em 'meses' (chaveado pelo período)
+    e os números do resumo geral do período.
+    """
+    totais = (df.groupby(['mes_ano', 'tipo'], observed=True)['amount'].sum()
+                .unstack(fill_value=0.0)
+                .reindex(columns=TIPO_DTYPE.categories, fill_value=0.0))
+    compras = df[df['tipo'] == 'Compra']
+    gastos_categoria = (compras.groupby(['mes_ano', 'categoria'], observed=True)['amount'].sum()
+                               .unstack(fill_value=0.0))
+    top5 = _top5_por_mes(compras)
+    
+    # Fatias de cada mês obtidas de uma só vez pelo groupby, sem uma máscara por mês
+    top5_por_mes = dict(list(top5.groupby('mes_ano', observed=True, sort=True)))
+    sem_compras = top5.iloc[:0]
+    
+    meses = {}
+    for mes, (total_compras, total_pagamentos, total_iofs) in zip(
+            totais.index, totais[['Compra', 'Pagamento', 'IOF']].to_numpy()):
+        valor_fatura = total_compras + total_iofs
+        meses[mes] = {
+            'valor_fatura': valor_fatura,
+            'total_pagamentos': total_pagamentos,
+            'saldo_final': total_pagamentos + valor_fatura,
+            'top5': top5_por_mes.get(mes, sem_compras),
+            'gastos_categoria': _gastos_categoria_do_mes(gastos_categoria, mes),
+        }
+    
+    return {
+        'meses': meses,
+        'periodo': (df['date'].min(), df['date'].max()),
+        'n_transacoes': len(df),
+        'n_meses': len(meses),
+        'total_gasto': totais['Compra'].sum() + totais['IOF'].sum(),
+        'total_pago': totais['Pagamento'].sum(),
+    }
+
+def imprimir_resumo_console(relatorio):
     """Imprime um resumo organizado de cada mês no console."""
     
     print("\n" + "="*60)
     print("RESUMO FINANCEIRO MENSAL (CONSOLE)")
     print("="*60)
 
-    meses = sorted(df['mes_ano'].unique())
-    
-    for mes in meses:
+    for mes, dados_mes in relatorio['meses'].items():
         print(f"\n================== MÊS: {mes} ==================")
-        df_mes = df[df['mes_ano'] == mes].copy()
-        compras = df_mes[df_mes['tipo'] == 'Compra']
-        pagamentos = df_mes[df_mes['tipo'] == 'Pagamento']
-        iofs = df_mes[df_mes['tipo'] == 'IOF']
-        
-        total_compras = compras['amount'].sum()
-        total_iofs = iofs['amount'].sum()
-        total_pagamentos = pagamentos['amount'].sum()
-        valor_fatura = total_compras + total_iofs
-        saldo_final = total_pagamentos + valor_fatura
+        valor_fatura = dados_mes['valor_fatura']
+        total_pagamentos = dados_mes['total_pagamentos']
+        saldo_final = dados_mes['saldo_final']
 
         print(f"\nResumo Financeiro:")
         print(f"  Valor Total da Fatura...: {formatar_valor(valor_fatura)}")
@@ -119,34 +327,63 @@ def imprimir_resumo_console(df):
         print(f"  Saldo (Fatura - Pgto)...: {formatar_valor(saldo_final, com_sinal=True)}")
 
         print(f"\n🏆 Top 5 Maiores Gastos:")
-        top_5_gastos = compras.nlargest(5, 'amount')
+        top_5_gastos = dados_mes['top5']
         
         if top_5_gastos.empty:
             print(f"  Nenhuma compra registrada este mês.")
         else:
-            for _, row in top_5_gastos.iterrows():
-                desc = str(row['title']).replace('\n', ' ')
+            valores_str = formatar_valores(top_5_gastos['amount'].to_numpy())
+            for titulo, valor_str in zip(top_5_gastos['title'].fillna('').to_numpy(), valores_str):
+                desc = str(titulo).replace('\n', ' ')
                 desc_curta = (desc[:40] + '...') if len(desc) > 40 else desc
-                valor_str = formatar_valor(row['amount'])
                 print(f"  {valor_str:>16} | {desc_curta}")
 
         print(f"\n📊 Gastos por Categoria:")
-        gastos_cat = compras.groupby('categoria')['amount'].sum().sort_values(ascending=False)
-        gastos_cat = gastos_cat[gastos_cat > 0]
+        gastos_cat = dados_mes['gastos_categoria']
         
         if gastos_cat.empty:
             print(f"  Nenhum gasto categorizado este mês.")
         else:
-            for categoria, valor in gastos_cat.items():
-                valor_str = formatar_valor(valor)
+            for categoria, valor_str in zip(gastos_cat.index.to_numpy(), formatar_valores(gastos_cat.to_numpy())):
                 print(f"  {valor_str:>16} | {categoria}")
 
-def gerar_pdf_resumo(df, nome_arquivo="resumo_financeiro.pdf"):
-    """Gera um relatório PDF similar ao resumo do console."""
-    doc = SimpleDocTemplate(nome_arquivo, pagesize=A4,
-                            rightMargin=72, leftMargin=72,
-                            topMargin=72, bottomMargin=18)
-    story = []
+# Estilos das tabelas do PDF, criados uma única vez e reutilizados em todos os meses
+ESTILO_TABELA_RESUMO = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+ESTILO_TABELA_LISTA = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
+    ('ALIGN', (1, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 9),
+    ('FONTSIZE', (0, 1), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+ESTILO_TABELA_GERAL = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 10),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
+    ('GRID', (0, 0), (-1, -1), 1, colors.black)
+])
+
+@lru_cache(maxsize=None)
+def _estilos_pdf():
+    """Monta (uma única vez) os estilos de parágrafo usados no relatório PDF."""
     styles = getSampleStyleSheet()
     
     titulo_style = ParagraphStyle(
@@ -170,135 +407,127 @@ def gerar_pdf_resumo(df, nome_arquivo="resumo_financeiro.pdf"):
     normal_style = styles['Normal']
     normal_style.alignment = TA_LEFT
     
-    valor_style = ParagraphStyle(
-        'Valor',
-        parent=normal_style,
-        alignment=TA_RIGHT,
-        fontSize=10
-    )
+    return {
+        'titulo': titulo_style,
+        'subtitulo': subtitulo_style,
+        'secao': styles['Heading3'],
+        'normal': normal_style,
+    }
+
+def _flowables_mes(mes, dados_mes, estilos):
+    """Gera os elementos (flowables) da página de um mês."""
+    yield Paragraph(f"MÊS: {mes}", estilos['subtitulo'])
+    yield Spacer(1, 12)
+    yield Paragraph("Resumo Financeiro:", estilos['secao'])
+    yield Spacer(1, 6)
+    valor_fatura = dados_mes['valor_fatura']
+    total_pagamentos = dados_mes['total_pagamentos']
+    saldo_final = dados_mes['saldo_final']
     
-    story.append(Paragraph("RESUMO FINANCEIRO MENSAL - NUBANK", titulo_style))
-    story.append(Spacer(1, 12))
+    dados_resumo = [
+        ['Item', 'Valor'],
+        ['Valor Total da Fatura', formatar_valor(valor_fatura)],
+        ['Pagamentos Recebidos', formatar_valor(total_pagamentos)],
+        ['Saldo (Fatura - Pgto)', formatar_valor(saldo_final, com_sinal=True)]
+    ]
+    tabela_resumo = Table(dados_resumo, colWidths=[2.5*inch, 1.5*inch])
+    tabela_resumo.setStyle(ESTILO_TABELA_RESUMO)
+    yield tabela_resumo
+    yield Spacer(1, 12)
     
-    meses = sorted(df['mes_ano'].unique())
+    yield Paragraph("🏆 Top 5 Maiores Gastos:", estilos['secao'])
+    yield Spacer(1, 6)
     
-    for mes in meses:
-        df_mes = df[df['mes_ano'] == mes].copy()
-        
-        story.append(Paragraph(f"MÊS: {mes}", subtitulo_style))
-        story.append(Spacer(1, 12))
-        story.append(Paragraph("Resumo Financeiro:", styles['Heading3']))
-        story.append(Spacer(1, 6))
-        compras = df_mes[df_mes['tipo'] == 'Compra']
-        pagamentos = df_mes[df_mes['tipo'] == 'Pagamento']
-        iofs = df_mes[df_mes['tipo'] == 'IOF']
-        total_compras = compras['amount'].sum()
-        total_iofs = iofs['amount'].sum()
-        total_pagamentos = pagamentos['amount'].sum()
-        valor_fatura = total_compras + total_iofs
-        saldo_final = total_pagamentos + valor_fatura
-        
-        dados_resumo = [
-            ['Item', 'Valor'],
-            ['Valor Total da Fatura', formatar_valor(valor_fatura)],
-            ['Pagamentos Recebidos', formatar_valor(total_pagamentos)],
-            ['Saldo (Fatura - Pgto)', formatar_valor(saldo_final, com_sinal=True)]
-        ]
-        tabela_resumo = Table(dados_resumo, colWidths=[2.5*inch, 1.5*inch])
-        tabela_resumo.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, 0), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-            ('BACKGROUND', (0, 1), (-1, -1), colors.beige),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
-        story.append(tabela_resumo)
-        story.append(Spacer(1, 12))
+    top_5_gastos = dados_mes['top5']
+    if not top_5_gastos.empty:
+        # Tamanhos conhecidos de antemão: cabeçalho + uma linha por gasto
+        dados_top = [None] * (len(top_5_gastos) + 1)
+        dados_top[0] = ['Valor', 'Descrição']
+        valores_str = formatar_valores(top_5_gastos['amount'].to_numpy())
+        for i, (titulo, valor_str) in enumerate(zip(top_5_gastos['title'].fillna('').to_numpy(), valores_str), 1):
+            desc = str(titulo).replace('\n', ' ')
+            desc_curta = (desc[:60] + '...') if len(desc) > 60 else desc  # Ajuste para PDF
+            dados_top[i] = [valor_str, desc_curta]
         
-        story.append(Paragraph("🏆 Top 5 Maiores Gastos:", styles['Heading3']))
-        story.append(Spacer(1, 6))
-        
-        top_5_gastos = compras.nlargest(5, 'amount')
-        if not top_5_gastos.empty:
-            dados_top = [['Valor', 'Descrição']]
-            for _, row in top_5_gastos.iterrows():
-                desc = str(row['title']).replace('\n', ' ')
-                desc_curta = (desc[:60] + '...') if len(desc) > 60 else desc  # Ajuste para PDF
-                dados_top.append([formatar_valor(row['amount']), desc_curta])
-            
-            tabela_top = Table(dados_top, colWidths=[1*inch, 4.5*inch])
-            tabela_top.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                ('ALIGN', (1, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(tabela_top)
-        else:
-            story.append(Paragraph("Nenhuma compra registrada este mês.", normal_style))
-        story.append(Spacer(1, 12))
-        
-        story.append(Paragraph("📊 Gastos por Categoria:", styles['Heading3']))
-        story.append(Spacer(1, 6))
-        
-        gastos_cat = compras.groupby('categoria')['amount'].sum().sort_values(ascending=False)
-        gastos_cat = gastos_cat[gastos_cat > 0]
-        if not gastos_cat.empty:
-            dados_cat = [['Valor', 'Categoria']]
-            for categoria, valor in gastos_cat.items():
-                dados_cat.append([formatar_valor(valor), categoria])
-            
-            tabela_cat = Table(dados_cat, colWidths=[1*inch, 4.5*inch])
-            tabela_cat.setStyle(TableStyle([
-                ('BACKGROUND', (0, 0), (-1, 0), colors.grey),
-                ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-                ('ALIGN', (0, 0), (0, -1), 'RIGHT'),
-                ('ALIGN', (1, 0), (-1, -1), 'LEFT'),
-                ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-                ('FONTSIZE', (0, 0), (-1, 0), 9),
-                ('FONTSIZE', (0, 1), (-1, -1), 8),
-                ('GRID', (0, 0), (-1, -1), 1, colors.black)
-            ]))
-            story.append(tabela_cat)
-        else:
-            story.append(Paragraph("Nenhum gasto categorizado este mês.", normal_style))
-        story.append(PageBreak())
+        tabela_top = Table(dados_top, colWidths=[1*inch, 4.5*inch])
+        tabela_top.setStyle(ESTILO_TABELA_LISTA)
+        yield tabela_top
+    else:
+        yield Paragraph("Nenhuma compra registrada este mês.", estilos['normal'])
+    yield Spacer(1, 12)
+    
+    yield Paragraph("📊 Gastos por Categoria:", estilos['secao'])
+    yield Spacer(1, 6)
     
-    story.append(Paragraph("RESUMO GERAL DO PERÍODO", titulo_style))
-    story.append(Spacer(1, 12))
+    gastos_cat = dados_mes['gastos_categoria']
+    if not gastos_cat.empty:
+        dados_cat = [None] * (len(gastos_cat) + 1)
+        dados_cat[0] = ['Valor', 'Categoria']
+        for i, (categoria, valor_str) in enumerate(zip(gastos_cat.index.to_numpy(), formatar_valores(gastos_cat.to_numpy())), 1):
+            dados_cat[i] = [valor_str, categoria]
+        
+        tabela_cat = Table(dados_cat, colWidths=[1*inch, 4.5*inch])
+        tabela_cat.setStyle(ESTILO_TABELA_LISTA)
+        yield tabela_cat
+    else:
+        yield Paragraph("Nenhum gasto categorizado este mês.", estilos['normal'])
+
+def _flowables_resumo_geral(relatorio, estilos):
+    """Gera os elementos da página final com o resumo geral do período."""
+    yield Paragraph("RESUMO GERAL DO PERÍODO", estilos['titulo'])
+    yield Spacer(1, 12)
     
-    total_gasto = df[df['tipo'] != 'Pagamento']['amount'].sum()
-    total_pago = df[df['tipo'] == 'Pagamento']['amount'].sum()
+    inicio, fim = relatorio['periodo']
     
     dados_geral = [
         ['Item', 'Valor'],
-        ['Período Analisado', f"{df['date'].min().strftime('%d/%m/%Y')} até {df['date'].max().strftime('%d/%m/%Y')}"],
-        ['Total de Meses', str(df['mes_ano'].nunique())],
-        ['Total de Transações', str(len(df))],
-        ['Total Gasto (Compras + IOF)', formatar_valor(total_gasto)],
-        ['Total Pago', formatar_valor(total_pago)]
+        ['Período Analisado', f"{inicio.strftime('%d/%m/%Y')} até {fim.strftime('%d/%m/%Y')}"],
+        ['Total de Meses', str(relatorio['n_meses'])],
+        ['Total de Transações', str(relatorio['n_transacoes'])],
+        ['Total Gasto (Compras + IOF)', formatar_valor(relatorio['total_gasto'])],
+        ['Total Pago', formatar_valor(relatorio['total_pago'])]
     ]
     tabela_geral = Table(dados_geral, colWidths=[2.5*inch, 2.5*inch])
-    tabela_geral.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), colors.darkblue),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 10),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 12),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.lightblue),
-        ('GRID', (0, 0), (-1, -1), 1, colors.black)
-    ]))
-    story.append(tabela_geral)
-    
-    doc.build(story)
+    tabela_geral.setStyle(ESTILO_TABELA_GERAL)
+    yield tabela_geral
+
+def _partes_pdf(relatorio, estilos):
+    """Divide o conteúdo do PDF em partes independentes: uma por mês e uma para o resumo geral."""
+    cabecalho = [Paragraph("RESUMO FINANCEIRO MENSAL - NUBANK", estilos['titulo']), Spacer(1, 12)]
+    for mes, dados_mes in relatorio['meses'].items():
+        yield cabecalho + list(_flowables_mes(mes, dados_mes, estilos))
+        cabecalho = []
+    yield cabecalho + list(_flowables_resumo_geral(relatorio, estilos))
+
+def _story_pdf(relatorio, estilos):
+    """Gera o conteúdo completo do PDF, mês a mês, com quebra de página entre as partes."""
+    for i, parte in enumerate(_partes_pdf(relatorio, estilos)):
+        if i:
+            yield PageBreak()
+        yield from parte
+
+def _renderizar_pdf(destino, flowables):
+    """Renderiza uma lista de flowables num PDF A4 (arquivo ou buffer)."""
+    doc = SimpleDocTemplate(destino, pagesize=A4,
+                            rightMargin=72, leftMargin=72,
+                            topMargin=72, bottomMargin=18,
+                            pageCompression=1)
+    doc.build(flowables)
+
+def gerar_pdf_resumo(relatorio, nome_arquivo="resumo_financeiro.pdf"):
+    """Gera um relatório PDF similar ao resumo do console."""
+    estilos = _estilos_pdf()
+    if PdfWriter is None:
+        _renderizar_pdf(nome_arquivo, list(_story_pdf(relatorio, estilos)))
+    else:
+        # Cada parte vira um PDF em memória e é anexada ao final: só os flowables
+        # de um mês existem por vez, independentemente do tamanho do período.
+        escritor = PdfWriter()
+        for parte in _partes_pdf(relatorio, estilos):
+            buffer = BytesIO()
+            _renderizar_pdf(buffer, parte)
+            escritor.append(buffer)
+        escritor.write(nome_arquivo)
     print(f"  ✓ PDF gerado: {nome_arquivo}")
 
 def main():
@@ -324,9 +553,10 @@ def main():
     print("\n2. 🔄 Limpando e categorizando dados...")
     df = limpar_e_processar_dados(df)
     print(f"  ✓ Dados processados ({len(df)} transações válidas).")
+    relatorio = montar_relatorio(df)
     
     print("\n3. 🖨️  Gerando resumo no console...")
-    imprimir_resumo_console(df)
+    imprimir_resumo_console(relatorio)
     
     print("\n4. 📄 Gerando relatório PDF...")
     nome_pdf = input("Digite o nome do arquivo PDF (ou Enter para 'resumo_financeiro.pdf'): ").strip()
@@ -334,20 +564,17 @@ def main():
         nome_pdf = "resumo_financeiro.pdf"
     if not nome_pdf.endswith('.pdf'):
         nome_pdf += '.pdf'
-    gerar_pdf_resumo(df, nome_pdf)
+    gerar_pdf_resumo(relatorio, nome_pdf)
 
     print("\n\n" + "="*60)
     print("RESUMO GERAL DO PERÍODO")
     print("="*60)
-    print(f"  • Período Analisado...: {df['date'].min().strftime('%d/%m/%Y')} até {df['date'].max().strftime('%d/%m/%Y')}")
-    print(f"  • Total de Meses......: {df['mes_ano'].nunique()}")
-    print(f"  • Total de Transações.: {len(df)}")
-    
-    total_gasto = df[df['tipo'] != 'Pagamento']['amount'].sum()
-    total_pago = df[df['tipo'] == 'Pagamento']['amount'].sum()
-    
-    print(f"  • Total Gasto (Compras + IOF): {formatar_valor(total_gasto)}")
-    print(f"  • Total Pago..............: {formatar_valor(total_pago)}")
+    inicio, fim = relatorio['periodo']
+    print(f"  • Período Analisado...: {inicio.strftime('%d/%m/%Y')} até {fim.strftime('%d/%m/%Y')}")
+    print(f"  • Total de Meses......: {relatorio['n_meses']}")
+    print(f"  • Total de Transações.: {relatorio['n_transacoes']}")
+    print(f"  • Total Gasto (Compras + IOF): {formatar_valor(relatorio['total_gasto'])}")
+    print(f"  • Total Pago..............: {formatar_valor(relatorio['total_pago'])}")
     print("="*60)
     print(f"\n🎉 Processo concluído! PDF salvo como '{nome_pdf}'.\n")
 